@@ -11,6 +11,7 @@
 # limitations under the License.
 from __future__ import absolute_import, division, print_function
 
+import json
 import os
 import socket
 import subprocess
@@ -21,9 +22,10 @@ from uuid import uuid4
 import click
 import presto.logging
 import pytest
+from filelock import FileLock
 from presto.client import PrestoQuery, PrestoRequest
 from presto.constants import DEFAULT_PORT
-from presto.exceptions import TimeoutError
+from presto.exceptions import Http503Error, TimeoutError
 
 
 logger = presto.logging.get_logger(__name__)
@@ -52,7 +54,7 @@ def get_default_presto_image_tag():
     return "prestosql/presto:" + PRESTO_VERSION
 
 
-def start_presto(image_tag=None):
+def start_presto(image_tag=None, detach=False):
     if not image_tag:
         image_tag = get_default_presto_image_tag()
 
@@ -69,6 +71,11 @@ def start_presto(image_tag=None):
         container_id,
         image_tag,
     ]
+    if detach:
+        docker_run.insert(2, "--detach")
+        subprocess.check_output(docker_run)
+        # follow the logs to know when the coordinator is started
+        docker_run = ["docker", "logs", "--follow", container_id]
     run = subprocess.Popen(docker_run, universal_newlines=True, stderr=subprocess.PIPE)
     return (container_id, run, "localhost", local_port)
 
@@ -79,7 +86,13 @@ def wait_for_presto_workers(host, port, timeout=180):
     t0 = time.time()
     while True:
         query = PrestoQuery(request, sql)
-        rows = list(query.execute())
+        try:
+            rows = list(query.execute())
+        except PrestoRequest.HTTP_EXCEPTIONS + (Http503Error,) as err:
+            # the port may be published before the coordinator accepts
+            # connections
+            logger.info("coordinator not reachable yet: {}".format(err))
+            rows = []
         if any(row[0] == "active" for row in rows):
             break
         if time.time() - t0 > timeout:
@@ -102,18 +115,24 @@ def wait_for_presto_coordinator(stream, timeout=180):
     return False
 
 
-def start_local_presto_server(image_tag):
-    container_id, proc, host, port = start_presto(image_tag)
+def start_local_presto_server(image_tag, detach=False):
+    container_id, proc, host, port = start_presto(image_tag, detach)
     print("presto.server.state starting")
     presto_ready = wait_for_presto_coordinator(proc.stderr)
     if not presto_ready:
         raise Exception("Presto server did not start")
+    if detach:
+        # stop following the logs, the container keeps running
+        proc.terminate()
+        proc.wait()
+        proc.stderr.close()
+        proc = None
     wait_for_presto_workers(host, port)
     print("presto.server.state ready")
     return container_id, proc, host, port
 
 
-def start_presto_and_wait(image_tag=None):
+def start_presto_and_wait(image_tag=None, detach=False):
     container_id = None
     proc = None
     host = os.environ.get("PRESTO_RUNNING_HOST", None)
@@ -121,7 +140,7 @@ def start_presto_and_wait(image_tag=None):
         port = os.environ.get("PRESTO_RUNNING_PORT", DEFAULT_PORT)
     else:
         container_id, proc, host, port = start_local_presto_server(
-            image_tag
+            image_tag, detach
         )
 
     print("presto.server.hostname {}".format(host))
@@ -150,16 +169,80 @@ def image_exists(name):
     return images and images[0].strip() == name
 
 
-@pytest.fixture(scope="module")
-def run_presto():
+def read_shared_presto_state(state_path):
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def write_shared_presto_state(state_path, state):
+    with open(state_path, "w") as f:
+        json.dump(state, f)
+
+
+def acquire_shared_presto(state_dir, image_tag):
+    """Start a Presto server shared by pytest-xdist workers, or reuse it.
+
+    Workers are separate processes, hence the file lock. The first worker
+    starts the server and writes its address to a state file, the others
+    read it from there. The state also counts the workers using the server.
+    """
+    state_path = os.path.join(state_dir, "presto-server.json")
+    with FileLock(state_path + ".lock"):
+        state = read_shared_presto_state(state_path)
+        if state is None:
+            # detach the container from this worker, which may exit before
+            # the other workers are done with it
+            container_id, _, host, port = start_presto_and_wait(
+                image_tag, detach=True
+            )
+            state = {
+                "container_id": container_id,
+                "host": host,
+                "port": port,
+                "workers": 0,
+            }
+        state["workers"] += 1
+        write_shared_presto_state(state_path, state)
+    return state
+
+
+def release_shared_presto(state_dir):
+    """Stop the shared Presto server once the last worker is done with it."""
+    state_path = os.path.join(state_dir, "presto-server.json")
+    with FileLock(state_path + ".lock"):
+        state = read_shared_presto_state(state_path)
+        state["workers"] -= 1
+        if state["workers"] > 0:
+            write_shared_presto_state(state_path, state)
+            return
+        os.remove(state_path)
+        if state["container_id"]:
+            stop_presto(state["container_id"], None)
+
+
+@pytest.fixture(scope="session")
+def run_presto(tmp_path_factory):
     image_tag = os.environ.get("PRESTO_IMAGE")
     if not image_tag:
         image_tag = get_default_presto_image_tag()
 
-    container_id, proc, host, port = start_presto_and_wait(image_tag)
-    yield proc, host, port
-    if container_id or proc:
-        stop_presto(container_id, proc)
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        container_id, proc, host, port = start_presto_and_wait(image_tag)
+        yield proc, host, port
+        if container_id or proc:
+            stop_presto(container_id, proc)
+        return
+
+    # all workers of a pytest-xdist run share the parent of their temporary
+    # directories
+    state_dir = str(tmp_path_factory.getbasetemp().parent)
+    state = acquire_shared_presto(state_dir, image_tag)
+    try:
+        yield None, state["host"], state["port"]
+    finally:
+        release_shared_presto(state_dir)
 
 
 @click.group()
@@ -11,6 +11,8 @@
 # limitations under the License.
 from __future__ import absolute_import, division, print_function
 
+from collections import Counter
+
 import fixtures
 import presto
 import pytest
@@ -18,27 +20,75 @@ from fixtures import run_presto
 from presto.transaction import IsolationLevel
 
 
-@pytest.fixture
-def presto_connection(run_presto):
-    _, host, port = run_presto
+def warm_up(connection):
+    """Open the HTTP connection to the coordinator ahead of the tests.
+
+    The connection's HTTP session keeps it alive for the queries that follow.
+    """
+    cur = connection.cursor()
+    cur.execute("SELECT 1")
+    cur.fetchall()
+
 
-    yield presto.dbapi.Connection(
-        host=host, port=port, user="test", source="test", max_attempts=1
+def connection_key(kwargs):
+    """Return a hashable key identifying connection arguments."""
+    return frozenset(
+        (name, frozenset(value.items()) if isinstance(value, dict) else value)
+        for name, value in kwargs.items()
     )
 
 
-@pytest.fixture
-def presto_connection_with_transaction(run_presto):
+@pytest.fixture(scope="module")
+def presto_connection_factory(run_presto):
+    """Return a function creating connections to the Presto server.
+
+    Keyword arguments override the default arguments of the connection.
+    Connections are cached by arguments and shared by the tests of the module.
+    """
     _, host, port = run_presto
+    connections = {}
+
+    def get_connection(**overrides):
+        kwargs = dict(host=host, port=port, user="test", source="test", max_attempts=1)
+        kwargs.update(overrides)
+        key = connection_key(kwargs)
+        if key not in connections:
+            connection = presto.dbapi.Connection(**kwargs)
+            warm_up(connection)
+            connection.commit()
+            connections[key] = connection
+        return connections[key]
+
+    yield get_connection
+    for connection in connections.values():
+        connection.close()
 
-    yield presto.dbapi.Connection(
-        host=host,
-        port=port,
-        user="test",
-        source="test",
-        max_attempts=1,
-        isolation_level=IsolationLevel.READ_UNCOMMITTED,
-    )
+
+@pytest.fixture(scope="module")
+def presto_connection(presto_connection_factory):
+    return presto_connection_factory()
+
+
+@pytest.fixture(scope="module")
+def presto_module_connection_with_transaction(presto_connection_factory):
+    return presto_connection_factory(isolation_level=IsolationLevel.READ_UNCOMMITTED)
+
+
+@pytest.fixture
+def presto_connection_with_transaction(presto_module_connection_with_transaction):
+    connection = presto_module_connection_with_transaction
+    yield connection
+    # Roll back any transaction left open by the test so that it does not
+    # leak into the next test sharing the connection.
+    try:
+        connection.rollback()
+    except RuntimeError:
+        # no transaction was started
+        pass
+    except presto.exceptions.DatabaseError:
+        # Presto already aborted the transaction, e.g. after a failed query,
+        # and Connection.rollback() does not forget it in that case.
+        connection._transaction = None
 
 
 def test_select_query(presto_connection):
@@ -48,7 +98,7 @@ def test_select_query(presto_connection):
     assert len(rows) > 0
     row = rows[0]
     assert row[2] == fixtures.PRESTO_VERSION
-    columns = dict([desc[:2] for desc in cur.description])
+    columns = {desc[0]: desc[1] for desc in cur.description}
     assert columns["node_id"] == "varchar"
     assert columns["http_uri"] == "varchar"
     assert columns["node_version"] == "varchar"
@@ -57,15 +107,11 @@ def test_select_query(presto_connection):
 
 
 def test_select_query_result_iteration(presto_connection):
-    cur0 = presto_connection.cursor()
-    cur0.execute("select custkey from tpch.sf1.customer LIMIT 10")
-    rows0 = cur0.genall()
-
-    cur1 = presto_connection.cursor()
-    cur1.execute("select custkey from tpch.sf1.customer LIMIT 10")
-    rows1 = cur1.fetchall()
+    cur = presto_connection.cursor()
+    cur.execute("select custkey from tpch.sf1.customer LIMIT 10")
+    rows0 = cur.genall()
 
-    assert len(list(rows0)) == len(rows1)
+    assert sum(1 for _ in rows0) == 10
 
 
 def test_select_query_result_iteration_statement_params(presto_connection):
@@ -93,30 +139,17 @@ def test_select_query_result_iteration_statement_params(presto_connection):
         assert row[0] >= 3
 
 
-@pytest.mark.parametrize('params', [
-    'NOT A LIST OR TUPPLE',
-    {'invalid', 'params'},
-    object,
-])
-def test_select_query_invalid_params(presto_connection, params):
-    cur = presto_connection.cursor()
-    with pytest.raises(AssertionError):
-        cur.execute('select ?', params=params)
-
-
 def test_select_cursor_iteration(presto_connection):
     cur0 = presto_connection.cursor()
     cur0.execute("select nationkey from tpch.sf1.nation")
-    rows0 = []
-    for row in cur0:
-        rows0.append(row)
+    rows0 = list(cur0)
 
-    cur1 = presto_connection.cursor()
-    cur1.execute("select nationkey from tpch.sf1.nation")
-    rows1 = cur1.fetchall()
+    # tpch.sf1.nation has 25 nations with keys 0 to 24
+    rows1 = [[nationkey] for nationkey in range(25)]
 
     assert len(rows0) == len(rows1)
-    assert sorted(rows0) == sorted(rows1)
+    # rows are lists, which are not hashable
+    assert Counter(map(tuple, rows0)) == Counter(map(tuple, rows1))
 
 
 def test_select_query_no_result(presto_connection):
@@ -126,31 +159,28 @@ def test_select_query_no_result(presto_connection):
     assert len(rows) == 0
 
 
+@pytest.mark.slow
 def test_select_query_stats(presto_connection):
     cur = presto_connection.cursor()
-    cur.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
+    cur.execute(
+        "SELECT * FROM tpch.sf1.customer WHERE mktsegment = 'BUILDING' LIMIT 1000"
+    )
 
+    keys = (
+        "completedSplits",
+        "cpuTimeMillis",
+        "processedBytes",
+        "processedRows",
+        "wallTimeMillis",
+    )
     query_id = cur.stats["queryId"]
-    completed_splits = cur.stats["completedSplits"]
-    cpu_time_millis = cur.stats["cpuTimeMillis"]
-    processed_bytes = cur.stats["processedBytes"]
-    processed_rows = cur.stats["processedRows"]
-    wall_time_millis = cur.stats["wallTimeMillis"]
+    stats = tuple(cur.stats[key] for key in keys)
 
-    while cur.fetchone() is not None:
+    while cur.fetchmany(256):
         assert query_id == cur.stats["queryId"]
-        assert completed_splits <= cur.stats["completedSplits"]
-        assert cpu_time_millis <= cur.stats["cpuTimeMillis"]
-        assert processed_bytes <= cur.stats["processedBytes"]
-        assert processed_rows <= cur.stats["processedRows"]
-        assert wall_time_millis <= cur.stats["wallTimeMillis"]
-
-        query_id = cur.stats["queryId"]
-        completed_splits = cur.stats["completedSplits"]
-        cpu_time_millis = cur.stats["cpuTimeMillis"]
-        processed_bytes = cur.stats["processedBytes"]
-        processed_rows = cur.stats["processedRows"]
-        wall_time_millis = cur.stats["wallTimeMillis"]
+        new_stats = tuple(cur.stats[key] for key in keys)
+        assert all(old <= new for old, new in zip(stats, new_stats))
+        stats = new_stats
 
 
 def test_select_failed_query(presto_connection):
@@ -160,11 +190,24 @@ def test_select_failed_query(presto_connection):
         cur.fetchall()
 
 
+@pytest.mark.slow
 def test_select_tpch_1000(presto_connection):
     cur = presto_connection.cursor()
-    cur.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
-    rows = cur.fetchall()
+    cur.arraysize = 1000
+    cur.execute("SELECT * FROM tpch.tiny.customer LIMIT 1000")
+    rows = cur.fetchmany()
     assert len(rows) == 1000
+    assert cur.fetchmany() == []
+
+
+@pytest.mark.slow
+def test_select_prefetch(presto_connection_factory):
+    connection = presto_connection_factory(prefetch=True)
+    cur = connection.cursor()
+    # tpch.tiny.lineitem is several megabytes, returned in multiple pages
+    cur.execute("SELECT * FROM tpch.tiny.lineitem")
+    rows = cur.fetchall()
+    assert len(rows) == 60175
 
 
 def test_cancel_query(presto_connection):
@@ -179,16 +222,9 @@ def test_cancel_query(presto_connection):
     assert "Cancel query failed; no running query" in str(cancel_error.value)
 
 
-def test_session_properties(run_presto):
-    _, host, port = run_presto
-
-    connection = presto.dbapi.Connection(
-        host=host,
-        port=port,
-        user="test",
-        source="test",
+def test_session_properties(presto_connection_factory):
+    connection = presto_connection_factory(
         session_properties={"query_max_run_time": "10m", "query_priority": "1"},
-        max_attempts=1,
     )
     cur = connection.cursor()
     cur.execute("SHOW SESSION")
@@ -201,34 +237,30 @@ def test_session_properties(run_presto):
             assert value == "1"
 
 
-def test_transaction_single(presto_connection_with_transaction):
+@pytest.mark.slow
+@pytest.mark.parametrize("finalizer", ["commit", "rollback"])
+def test_transaction_finalize(presto_connection_with_transaction, finalizer):
     connection = presto_connection_with_transaction
+    results = []
     for _ in range(3):
         cur = connection.cursor()
-        cur.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
-        rows = cur.fetchall()
-        connection.commit()
-        assert len(rows) == 1000
+        cur.execute("SELECT * FROM tpch.tiny.customer LIMIT 1000")
+        results.append(cur.fetchall())
+    getattr(connection, finalizer)()
 
-
-def test_transaction_rollback(presto_connection_with_transaction):
-    connection = presto_connection_with_transaction
-    for _ in range(3):
-        cur = connection.cursor()
-        cur.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
-        rows = cur.fetchall()
-        connection.rollback()
+    for rows in results:
         assert len(rows) == 1000
 
 
+@pytest.mark.slow
 def test_transaction_multiple(presto_connection_with_transaction):
     with presto_connection_with_transaction as connection:
         cur1 = connection.cursor()
-        cur1.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
+        cur1.execute("SELECT * FROM tpch.tiny.customer LIMIT 1000")
         rows1 = cur1.fetchall()
 
         cur2 = connection.cursor()
-        cur2.execute("SELECT * FROM tpch.sf1.customer LIMIT 1000")
+        cur2.execute("SELECT * FROM tpch.tiny.customer LIMIT 1000")
         rows2 = cur2.fetchall()
 
     assert len(rows1) == 1000
@@ -36,6 +36,7 @@ from __future__ import absolute_import, division, print_function
 
 import copy
 import os
+from concurrent.futures import Executor, Future  # NOQA for mypy types
 from typing import Any, Dict, List, Optional, Text, Tuple, Union  # NOQA for mypy types
 
 import presto.logging
@@ -157,6 +158,12 @@ class PrestoRequest(object):
     :request_timeout: How long (in seconds) to wait for the server to send
                       data before giving up, as a float or a
                       ``(connect timeout, read timeout)`` tuple.
+    :prefetch_executor: executor used to send the HTTP request for the next
+                        page of a query result while the current page is
+                        consumed. ``None`` disables prefetching. The caller
+                        owns the executor and is responsible for shutting it
+                        down. Prefetch cannot be used with *auth*, as
+                        authentication handlers are not thread-safe.
 
     The client initiates a query by sending an HTTP POST to the
     coordinator. It then gets a response back from the coordinator with:
@@ -209,7 +216,8 @@ class PrestoRequest(object):
         max_attempts=MAX_ATTEMPTS,  # type: int
         request_timeout=constants.DEFAULT_REQUEST_TIMEOUT,  # type: Union[float, Tuple[float, float]]
         handle_retry=exceptions.RetryWithExponentialBackoff(),
-        verify=True     # type: Any
+        verify=True,     # type: Any
+        prefetch_executor=None,  # type: Optional[Executor]
     ):
         # type: (...) -> None
         self._client_session = ClientSession(
@@ -232,12 +240,17 @@ class PrestoRequest(object):
             # mypy cannot follow module import
             self._http_session = self.http.Session()  # type: ignore
             self._http_session.verify = verify
-        self._http_session.headers.update(self.http_headers)
+            # A session passed by the caller may be shared with other
+            # requests, and with their prefetch threads, so its headers are
+            # left untouched. Every request sets its headers explicitly.
+            self._http_session.headers.update(self.http_headers)
         self._exceptions = self.HTTP_EXCEPTIONS
         self._auth = auth
         if self._auth:
             if http_scheme == constants.HTTP:
                 raise ValueError("cannot use authentication with HTTP")
+            if prefetch_executor is not None:
+                raise ValueError("cannot use authentication with prefetch")
             self._auth.set_http_session(self._http_session)
             self._exceptions += self._auth.get_exceptions()
 
@@ -246,6 +259,22 @@ class PrestoRequest(object):
         self._handle_retry = handle_retry
         self.max_attempts = max_attempts
         self._http_scheme = http_scheme
+        self._prefetch_executor = prefetch_executor
+
+    def __deepcopy__(self, memo):
+        # The prefetch executor holds locks and threads, it is shared by the
+        # copies rather than copied.
+        memo[id(self._prefetch_executor)] = self._prefetch_executor
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        for name, value in self.__dict__.items():
+            setattr(copied, name, copy.deepcopy(value, memo))
+        return copied
+
+    @property
+    def prefetch(self):
+        # type: () -> bool
+        return self._prefetch_executor is not None
 
     @property
     def transaction_id(self):
@@ -371,8 +400,28 @@ class PrestoRequest(object):
             proxies=PROXIES,
         )
 
+    def prefetch_get(self, url):
+        # type: (Text) -> Future
+        """Send a GET request in the background with the prefetch executor.
+
+        The headers are built in the caller's thread because the session
+        properties they are built from may change while the request runs.
+        """
+        return self._prefetch_executor.submit(
+            self._get,
+            url,
+            headers=self.http_headers,
+            timeout=self._request_timeout,
+            proxies=PROXIES,
+        )
+
     def delete(self, url):
-        return self._delete(url, timeout=self._request_timeout, proxies=PROXIES)
+        return self._delete(
+            url,
+            headers=self.http_headers,
+            timeout=self._request_timeout,
+            proxies=PROXIES,
+        )
 
     def _process_error(self, error, query_id):
         error_type = error["errorType"]
@@ -489,6 +538,7 @@ class PrestoQuery(object):
         self._sql = sql
         self._result = PrestoResult(self)
         self._response_headers = None
+        self._next_response = None  # type: Optional[Future]
 
     @property
     def columns(self):
@@ -526,13 +576,20 @@ class PrestoQuery(object):
         self._warnings = getattr(status, "warnings", [])
         if status.next_uri is None:
             self._finished = True
+        else:
+            self._prefetch(status.next_uri)
         self._result = PrestoResult(self, status.rows)
         return self._result
 
     def fetch(self):
         # type: () -> List[List[Any]]
         """Continue fetching data for the current query_id"""
-        response = self._request.get(self._request.next_uri)
+        if self._next_response is not None:
+            # drop the future first so that a failed prefetch is not reused
+            next_response, self._next_response = self._next_response, None
+            response = next_response.result()
+        else:
+            response = self._request.get(self._request.next_uri)
         status = self._request.process(response)
         if status.columns:
             self._columns = status.columns
@@ -541,8 +598,21 @@ class PrestoQuery(object):
         self._response_headers = response.headers
         if status.next_uri is None:
             self._finished = True
+        else:
+            self._prefetch(status.next_uri)
         return status.rows
 
+    def _prefetch(self, next_uri):
+        # type: (Text) -> None
+        """Request the next page in the background if prefetch is enabled.
+
+        Only the HTTP request runs in the background. The response is
+        processed by :meth:`fetch` to keep the state of the request in the
+        caller's thread.
+        """
+        if self._request.prefetch:
+            self._next_response = self._request.prefetch_get(next_uri)
+
     def cancel(self):
         # type: () -> None
         """Cancel the current query"""
@@ -550,6 +620,9 @@ class PrestoQuery(object):
             return
 
         self._cancelled = True
+        if self._next_response is not None:
+            self._next_response.cancel()
+            self._next_response = None
         url = self._request.get_url("/v1/query/{}".format(self.query_id))
         logger.debug("cancelling query: %s", self.query_id)
         response = self._request.delete(url)
@@ -23,6 +23,7 @@ DEFAULT_SCHEMA = None  # type: Optional[Text]
 DEFAULT_AUTH = None  # type: Optional[Any]
 DEFAULT_MAX_ATTEMPTS = 3
 DEFAULT_REQUEST_TIMEOUT = 30.0  # type: float
+DEFAULT_PREFETCH_WORKERS = 4
 
 HTTP = "http"
 HTTPS = "https"
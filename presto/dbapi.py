@@ -31,7 +31,9 @@ except ImportError:
 
 import copy
 import datetime
+import itertools
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from presto import constants
 import presto.exceptions
@@ -84,7 +86,8 @@ class Connection(object):
         max_attempts=constants.DEFAULT_MAX_ATTEMPTS,
         request_timeout=constants.DEFAULT_REQUEST_TIMEOUT,
         isolation_level=IsolationLevel.AUTOCOMMIT,
-        verify=True
+        verify=True,
+        prefetch=False,
     ):
         self.host = host
         self.port = port
@@ -102,6 +105,8 @@ class Connection(object):
         self.redirect_handler = redirect_handler
         self.max_attempts = max_attempts
         self.request_timeout = request_timeout
+        self.prefetch = prefetch
+        self._prefetch_executor = None
 
         self._isolation_level = isolation_level
         self._request = None
@@ -127,9 +132,21 @@ class Connection(object):
             self.close()
 
     def close(self):
-        """Presto does not have anything to close"""
+        """Presto does not have anything to close. Only the threads used to
+        prefetch query results are stopped."""
         # TODO cancel outstanding queries?
-        pass
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
+
+    def _get_prefetch_executor(self):
+        if not self.prefetch:
+            return None
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=constants.DEFAULT_PREFETCH_WORKERS
+            )
+        return self._prefetch_executor
 
     def start_transaction(self):
         self._transaction = Transaction(self._create_request())
@@ -165,6 +182,7 @@ class Connection(object):
             self.redirect_handler,
             self.max_attempts,
             self.request_timeout,
+            prefetch_executor=self._get_prefetch_executor(),
         )
 
     def cursor(self):
@@ -400,14 +418,11 @@ class Cursor(object):
         if size is None:
             size = self.arraysize
 
-        result = []
-        for _ in range(size):
-            row = self.fetchone()
-            if row is None:
-                break
-            result.append(row)
-
-        return result
+        try:
+            # a negative size returns no rows, as range() would
+            return list(itertools.islice(self._iterator, max(size, 0)))
+        except presto.exceptions.HttpError as err:
+            raise presto.exceptions.OperationalError(str(err))
 
     def genall(self):
         return self._query.result
@@ -31,9 +31,16 @@ kerberos_require = ["requests_kerberos"]
 
 all_require = [kerberos_require]
 
-tests_require = all_require + ["httpretty", "pytest", "pytest-runner", "mock"]
+tests_require = all_require + [
+    "filelock",
+    "httpretty",
+    "pytest",
+    "pytest-runner",
+    "pytest-xdist",
+    "mock",
+]
 
-py27_require = ["ipaddress", "typing"]
+py27_require = ["futures", "ipaddress", "typing"]
 
 setup(
     name="presto-client",
@@ -17,7 +17,9 @@ import httpretty
 import pytest
 import requests
 import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from unittest import mock
@@ -673,3 +675,111 @@ def test_presto_query_response_headers():
         # Validate the result is an instance of PrestoResult
         assert isinstance(result, PrestoResult)
 
+
+def test_presto_query_prefetch():
+    """
+    Validates that `PrestoQuery` requests the next page of the result with the
+    prefetch executor of the request, before the rows of the current page are
+    consumed, and with headers built in the caller's thread.
+    """
+    def mock_response(data):
+        return mock.Mock(
+            ok=True, status_code=200, headers={}, **{"json.return_value": data}
+        )
+
+    resp_data_get_1 = dict(RESP_DATA_GET_0)
+    del resp_data_get_1["nextUri"]
+    responses = [mock_response(RESP_DATA_GET_0), mock_response(resp_data_get_1)]
+    first_page_requested = threading.Event()
+
+    def get(url, **kwargs):
+        first_page_requested.set()
+        return responses.pop(0)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    req = PrestoRequest(
+        host="coordinator", port=8080, user="test", prefetch_executor=executor
+    )
+    with mock.patch.object(
+        req, "post", return_value=mock_response(RESP_DATA_POST_0)
+    ), mock.patch.object(req, "_get", side_effect=get) as mock_get:
+        query = PrestoQuery(request=req, sql="SELECT * FROM nation")
+        result = query.execute()
+        assert first_page_requested.wait(timeout=5)
+
+        rows = list(result)
+    executor.shutdown()
+
+    assert rows == RESP_DATA_GET_0["data"] * 2
+    assert [args for args, _ in mock_get.call_args_list] == [
+        (RESP_DATA_POST_0["nextUri"],),
+        (RESP_DATA_GET_0["nextUri"],),
+    ]
+    for _, kwargs in mock_get.call_args_list:
+        assert kwargs["headers"] == req.http_headers
+
+
+def test_presto_query_prefetch_error():
+    """
+    Validates that `PrestoQuery.fetch` sends a new request for the next page
+    after the prefetched request failed.
+    """
+    def mock_response(data):
+        return mock.Mock(
+            ok=True, status_code=200, headers={}, **{"json.return_value": data}
+        )
+
+    resp_data_get_1 = dict(RESP_DATA_GET_0)
+    del resp_data_get_1["nextUri"]
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    req = PrestoRequest(
+        host="coordinator", port=8080, user="test", prefetch_executor=executor
+    )
+    with mock.patch.object(
+        req, "post", return_value=mock_response(RESP_DATA_POST_0)
+    ), mock.patch.object(
+        req,
+        "_get",
+        side_effect=[requests.ConnectionError, mock_response(resp_data_get_1)],
+    ) as mock_get:
+        query = PrestoQuery(request=req, sql="SELECT * FROM nation")
+        query.execute()
+        with pytest.raises(requests.ConnectionError):
+            query.fetch()
+
+        assert query.fetch() == resp_data_get_1["data"]
+    executor.shutdown()
+
+    assert mock_get.call_count == 2
+
+
+def test_request_prefetch_with_authentication():
+    """
+    Validates that `PrestoRequest` rejects prefetch with authentication, as
+    authentication handlers are not thread-safe.
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    with pytest.raises(ValueError):
+        PrestoRequest(
+            host="coordinator",
+            port=8080,
+            user="test",
+            http_scheme=constants.HTTPS,
+            auth=KerberosAuthentication(),
+            prefetch_executor=executor,
+        )
+    executor.shutdown()
+
+
+def test_request_shared_http_session_headers():
+    """
+    Validates that `PrestoRequest` does not modify the headers of an HTTP
+    session passed by the caller, which may be used by prefetch threads.
+    """
+    http_session = requests.Session()
+    session_headers = dict(http_session.headers)
+    PrestoRequest(
+        host="coordinator", port=8080, user="test", http_session=http_session
+    )
+    assert dict(http_session.headers) == session_headers
@@ -0,0 +1,120 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    from unittest import mock
+except ImportError:
+    # python 2
+    import mock
+
+import pytest
+from presto.client import PrestoResult
+from presto.dbapi import Connection
+
+
+ROWS = [[1, "one"], [2, "two"], [3, "three"]]
+
+
+class FakePrestoQuery(object):
+    """Finished query returning ``ROWS`` without any HTTP request."""
+
+    def __init__(self, request, sql):
+        self._request = request
+        self._sql = sql
+        self._result = PrestoResult(self, list(ROWS))
+
+    @property
+    def result(self):
+        return self._result
+
+    def execute(self, additional_http_headers=None):
+        return self._result
+
+    def is_finished(self):
+        return True
+
+
+def execute_fake_query():
+    connection = Connection("coordinator", user="test")
+    cur = connection.cursor()
+    with mock.patch("presto.client.PrestoQuery", FakePrestoQuery):
+        cur.execute("SELECT * FROM fake")
+    return cur
+
+
+def test_cursor_iteration():
+    """
+    Validates that iterating over the cursor yields the same rows as
+    `Cursor.fetchall`.
+    """
+    assert list(execute_fake_query()) == ROWS
+    assert execute_fake_query().fetchall() == ROWS
+
+
+def test_cursor_genall():
+    """
+    Validates that `Cursor.genall` yields the rows of the query result lazily.
+    """
+    rows = execute_fake_query().genall()
+    assert isinstance(rows, PrestoResult)
+    assert list(rows) == ROWS
+
+
+def test_cursor_fetchmany():
+    """
+    Validates that `Cursor.fetchmany` returns at most `size` rows per call, or
+    `Cursor.arraysize` rows when no size is given, and an empty list once all
+    rows have been fetched or when `size` is negative.
+    """
+    cur = execute_fake_query()
+    assert cur.fetchmany(-1) == []
+    assert cur.fetchmany() == ROWS[:1]
+    assert cur.fetchmany(5) == ROWS[1:]
+    assert cur.fetchmany(5) == []
+
+
+@pytest.mark.parametrize('params', [
+    'NOT A LIST OR TUPPLE',
+    {'invalid', 'params'},
+    object,
+])
+def test_select_query_invalid_params(params):
+    """
+    Validates that `Cursor.execute` rejects params that are not a list or a
+    tuple before sending any request to the coordinator.
+    """
+    connection = Connection("127.0.0.1", port=1, user="test", max_attempts=1)
+    cur = connection.cursor()
+    with pytest.raises(AssertionError):
+        cur.execute('select ?', params=params)
+
+
+def test_connection_prefetch_executor():
+    """
+    Validates that a connection with prefetch enabled shares one executor
+    between the requests of its cursors and shuts it down on close.
+    """
+    assert not Connection("coordinator", user="test").cursor()._request.prefetch
+
+    connection = Connection("coordinator", user="test", prefetch=True)
+    request0 = connection.cursor()._request
+    request1 = connection.cursor()._request
+    assert request0.prefetch
+    assert request0._prefetch_executor is request1._prefetch_executor
+
+    executor = request0._prefetch_executor
+    connection.close()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)